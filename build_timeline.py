@@ -1,8 +1,47 @@
 # build_timeline.py
 
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import argparse
+from numba import njit
+
+NAT_NS = np.iinfo(np.int64).min # pandas' internal representation of NaT
+
+TIMELINE_ROW_GROUP_SIZE = 50_000
+
+# Only these lap columns are used downstream, so only these are read from the laps file
+LAP_COLUMNS = [ "Driver", "LapNumber", "Position", "Compound", "TyreLife", "LapTime", "LapStartTime", "Sector1SessionTime", "Sector2SessionTime", "Sector3SessionTime", "Sector1Time", "Sector2Time", "Sector3Time", "PitInTime", "PitOutTime" ]
+
+@njit(cache=True, boundscheck=False)
+def _gap_and_interval_ns(times_ns, codes, ngroups):
+    leader_ns = np.full(ngroups, NAT_NS)
+    prev_ns = np.full(ngroups, NAT_NS)
+    gap = np.full(len(times_ns), NAT_NS)
+    interval = np.full(len(times_ns), NAT_NS)
+    for i in range(len(times_ns)):
+        code = codes[i]
+        if code < 0:
+            continue
+        t = times_ns[i]
+        # Rows arrive in time order, so the first row seen for a group is its leader
+        if leader_ns[code] == NAT_NS:
+            leader_ns[code] = t
+        else:
+            interval[i] = t - prev_ns[code]
+        gap[i] = t - leader_ns[code]
+        prev_ns[code] = t
+    return gap, interval
+
+def gap_and_interval(times, codes):
+    """
+    Computes the gap to the group leader and the interval to the car ahead in a single pass.
+    Expects timedelta64[ns] times sorted ascending and one non-negative group code per row (-1 for ungrouped rows).
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    ngroups = int(codes.max()) + 1 if len(codes) else 0
+    gap, interval = _gap_and_interval_ns(times.view('int64'), codes, max(ngroups, 1))
+    return gap.view('timedelta64[ns]'), interval.view('timedelta64[ns]')
 
 def build_event_timeline(year: int, event: str):
     """
@@ -14,8 +53,8 @@ def build_event_timeline(year: int, event: str):
     
     # Paths
     event_folder = Path(f"raw_data/{year}_{event_name_safe}")
-    laps_file = event_folder / "laps.pkl"
-    results_file = event_folder / "results.pkl"
+    laps_file = event_folder / "laps.parquet"
+    results_file = event_folder / "results.parquet"
     out_dir = Path("processed_data")
     out_dir.mkdir(parents=True, exist_ok=True)
     timeline_out_file = out_dir / f"{year}_{event_name_safe}_timeline.parquet"
@@ -23,47 +62,53 @@ def build_event_timeline(year: int, event: str):
 
     # Load data
     try:
-        laps_df = pd.read_pickle(laps_file)
-        results_df = pd.read_pickle(results_file).rename(columns={"Abbreviation": "Driver"})
+        laps_df = pd.read_parquet(laps_file, columns=LAP_COLUMNS)
+        results_df = pd.read_parquet(results_file, columns=["Abbreviation", "Status"]).rename(columns={"Abbreviation": "Driver"})
     except FileNotFoundError as e:
         print(f"❌ Error: Could not load raw data file: {e.filename}"); exit(1)
 
     # --- NEW: Create and save a race_info file with leader lap start times ---
     print("Creating race_info file for syncing...")
-    # Find the first driver to start each lap (our de facto leader for that lap)
-    leader_laps = laps_df.loc[laps_df.groupby('LapNumber')['LapStartTime'].idxmin()]
-    lap_start_times = leader_laps[['LapNumber', 'LapStartTime']].set_index('LapNumber')
-    
+    # The first driver to start each lap is our de facto leader, so the lap's start time is simply the earliest LapStartTime
     race_info = {
-        'lap_start_times': lap_start_times['LapStartTime'].to_dict()
+        'lap_start_times': laps_df.groupby('LapNumber', sort=True)['LapStartTime'].min().to_dict()
     }
     pd.to_pickle(race_info, race_info_out_file)
     print(f"✅ Saved race_info file to {race_info_out_file}")
     # --- End of new section ---
     
-    # The rest of the timeline building is the same as before...
-    # (Omitted for brevity, no changes to this logic)
-    laps_df['IsPersonalBestS1'] = laps_df['Sector1Time'] == laps_df.groupby('Driver')['Sector1Time'].cummin()
-    laps_df['IsPersonalBestS2'] = laps_df['Sector2Time'] == laps_df.groupby('Driver')['Sector2Time'].cummin()
-    laps_df['IsPersonalBestS3'] = laps_df['Sector3Time'] == laps_df.groupby('Driver')['Sector3Time'].cummin()
-    laps_to_process = laps_df[[ "Driver", "LapNumber", "Position", "Compound", "TyreLife", "LapTime", "Sector1SessionTime", "Sector2SessionTime", "Sector3SessionTime", "Sector1Time", "Sector2Time", "Sector3Time", "PitInTime", "PitOutTime", "IsPersonalBestS1", "IsPersonalBestS2", "IsPersonalBestS3" ]].copy()
-    status_df = results_df[['Driver', 'Status']].rename(columns={'Status': 'FinalStatus'}); laps = laps_to_process.merge(status_df, on='Driver', how='left')
-    all_events = []
-    for row in laps.itertuples():
-        lap_data = { "Driver": row.Driver, "LapNumber": row.LapNumber, "Position": row.Position, "Compound": row.Compound, "TyreLife": row.TyreLife, "LapTime": row.LapTime, "Sector1Time": row.Sector1Time, "Sector2Time": row.Sector2Time, "Sector3Time": row.Sector3Time, "FinalStatus": row.FinalStatus, "IsPersonalBestS1": row.IsPersonalBestS1, "IsPersonalBestS2": row.IsPersonalBestS2, "IsPersonalBestS3": row.IsPersonalBestS3 }
-        if pd.notna(row.Sector1SessionTime): all_events.append({"Time": row.Sector1SessionTime, "EventType": "Sector1", **lap_data})
-        if pd.notna(row.Sector2SessionTime): all_events.append({"Time": row.Sector2SessionTime, "EventType": "Sector2", **lap_data})
-        if pd.notna(row.Sector3SessionTime): all_events.append({"Time": row.Sector3SessionTime, "EventType": "Lap", **lap_data})
-        if pd.notna(row.PitInTime): all_events.append({"Time": row.PitInTime, "EventType": "PitIn", **lap_data})
-        if pd.notna(row.PitOutTime): all_events.append({"Time": row.PitOutTime, "EventType": "PitOut", **lap_data})
-    if not all_events: print("❌ No events found."); return
-    timeline_df = pd.DataFrame(all_events).sort_values(by="Time").reset_index(drop=True)
+    sector_cols = ['Sector1Time', 'Sector2Time', 'Sector3Time']
+    # Run the cummin on raw int64 nanoseconds. Missing sectors (NaT) are mapped to INT64_MAX so they never become a best.
+    sector_ns = laps_df[sector_cols].to_numpy(dtype='timedelta64[ns]').view('int64')
+    sector_missing = sector_ns == NAT_NS
+    sector_ns = np.where(sector_missing, np.iinfo(np.int64).max, sector_ns)
+    personal_best_so_far = pd.DataFrame(sector_ns).groupby(laps_df['Driver'].to_numpy(), sort=False).cummin().to_numpy()
+    laps_df[['IsPersonalBestS1', 'IsPersonalBestS2', 'IsPersonalBestS3']] = (sector_ns == personal_best_so_far) & ~sector_missing
+    final_status = dict(zip(results_df['Driver'], results_df['Status']))
+    laps_df['FinalStatus'] = laps_df['Driver'].map(final_status)
+    # Emit one event per non-null timing column. Only the event time, type and source lap row are collected per
+    # event type; the lap data columns are then gathered once, already in time order, instead of once per event type.
+    event_columns = { "Sector1SessionTime": "Sector1", "Sector2SessionTime": "Sector2", "Sector3SessionTime": "Lap", "PitInTime": "PitIn", "PitOutTime": "PitOut" }
+    lap_data_columns = [ "Driver", "LapNumber", "Position", "Compound", "TyreLife", "LapTime", "Sector1Time", "Sector2Time", "Sector3Time", "FinalStatus", "IsPersonalBestS1", "IsPersonalBestS2", "IsPersonalBestS3" ]
+    event_rows = [np.flatnonzero(laps_df[time_col].notna().to_numpy()) for time_col in event_columns]
+    source_rows = np.concatenate(event_rows)
+    if len(source_rows) == 0: print("❌ No events found."); return
+    event_times = np.concatenate([laps_df[time_col].to_numpy()[rows] for time_col, rows in zip(event_columns, event_rows)])
+    event_types = np.repeat(list(event_columns.values()), [len(rows) for rows in event_rows])
+    order = np.argsort(event_times, kind="stable")
+    source_rows = source_rows[order]
+    timeline_df = pd.DataFrame({"Time": event_times[order], "EventType": event_types[order], **{col: laps_df[col].to_numpy()[source_rows] for col in lap_data_columns}})
+    # Low-cardinality string columns become categoricals: int codes for groupby, dictionary-encoded in Parquet
+    for col in ("Driver", "Compound", "EventType", "FinalStatus"):
+        timeline_df[col] = timeline_df[col].astype("category")
     print("Calculating gaps and intervals...")
-    sector_groups = timeline_df.groupby(['LapNumber', 'EventType'])
-    leader_time_per_sector = sector_groups['Time'].transform('min')
-    timeline_df['GapToLeader'] = timeline_df['Time'] - leader_time_per_sector
-    timeline_df['Interval'] = sector_groups['Time'].diff().fillna(pd.NaT)
-    timeline_df.to_parquet(timeline_out_file)
+    # Pack (LapNumber, EventType) into one integer group key: 3 low bits for the 5 event type codes, lap number above
+    lap_numbers = timeline_df['LapNumber'].to_numpy()
+    event_type_codes = timeline_df['EventType'].cat.codes.to_numpy().astype(np.int64)
+    sector_codes = np.where(np.isnan(lap_numbers), -1, (np.nan_to_num(lap_numbers).astype(np.int64) << 3) | event_type_codes)
+    timeline_df['GapToLeader'], timeline_df['Interval'] = gap_and_interval(timeline_df['Time'].to_numpy(), sector_codes)
+    # Small row groups keep per-group column statistics useful for readers that only need a lap range
+    timeline_df.to_parquet(timeline_out_file, engine='pyarrow', compression='zstd', compression_level=3, row_group_size=TIMELINE_ROW_GROUP_SIZE, use_dictionary=True)
     print(f"✅ Saved timeline to {timeline_out_file}")
 
 if __name__ == "__main__":
@@ -1,7 +1,16 @@
+import argparse
+import datetime
+import multiprocessing
+import os
 import sys
 import fastf1
 import pandas as pd
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+CACHE_DIR = 'f1_cache'
+# FastF1 rate-limits requests per process (fastf1/req.py), so every extra worker multiplies the request rate
+# the API sees. Keep this low; going over the API limits can get the client blocked.
+MAX_FETCH_WORKERS = 2
 
 def fetch_data(year, event):
     """
@@ -15,11 +24,11 @@ def fetch_data(year, event):
         return False
 
     event_name_safe = event.replace(' ', '_')
-    output_dir = Path(f"raw_data/{year}_{event_name_safe}")
-    output_dir.mkdir(parents=True, exist_ok=True)
+    output_dir = f"raw_data/{year}_{event_name_safe}"
+    os.makedirs(output_dir, exist_ok=True)
 
     try:
-        # Save key session data to pickle files
+        # Save key session data to zstd-compressed Parquet files (columnar, so readers can load only the columns they need)
         laps = session.laps
         results = session.results
         session_info = session.session_info
@@ -27,20 +36,22 @@ def fetch_data(year, event):
         # --- FIX FOR INCONSISTENT DATA TYPES ---
         # The race_control_messages Time column can be inconsistent.
         # Ensure it is a consistent Timedelta before saving.
-        race_control_messages = session.race_control_messages.copy()
+        race_control_messages = session.race_control_messages
         if not race_control_messages.empty:
-            race_control_messages['Time'] = race_control_messages['Time'] - race_control_messages['Time'].iloc[0]
+            # assign() builds only the new Time column and shares the others, instead of deep-copying the frame
+            race_control_messages = race_control_messages.assign(Time=race_control_messages['Time'] - race_control_messages['Time'].iloc[0])
         # End of fix
         
         weather_data = session.weather_data
         track_status = session.track_status
 
-        laps.to_pickle(output_dir / "laps.pkl")
-        results.to_pickle(output_dir / "results.pkl")
-        session_info.to_pickle(output_dir / "session_info.pkl")
-        race_control_messages.to_pickle(output_dir / "race_control.pkl")
-        weather_data.to_pickle(output_dir / "weather_data.pkl")
-        track_status.to_pickle(output_dir / "track_status.pkl")
+        laps.to_parquet(f"{output_dir}/laps.parquet", compression='zstd')
+        results.to_parquet(f"{output_dir}/results.parquet", compression='zstd')
+        race_control_messages.to_parquet(f"{output_dir}/race_control.parquet", compression='zstd')
+        weather_data.to_parquet(f"{output_dir}/weather_data.parquet", compression='zstd')
+        track_status.to_parquet(f"{output_dir}/track_status.parquet", compression='zstd')
+        # session_info is a plain dict, not a table, so it stays a pickle
+        pd.to_pickle(session_info, f"{output_dir}/session_info.pkl")
         
         print(f"✅ Raw data for {year} {event} saved successfully.")
         return True
@@ -48,15 +59,70 @@ def fetch_data(year, event):
         print(f"❌ Error saving data: {e}")
         return False
 
+def _init_fetch_worker(cache_write_lock):
+    """
+    Enables the FastF1 cache in a worker process and makes its writes to the shared HTTP cache take cache_write_lock.
+    """
+    # The cache setting is per process, so each worker has to enable it itself
+    fastf1.Cache.enable_cache(CACHE_DIR)
+    # All workers share one SQLite HTTP cache file, so writes to it are serialized across processes. The parsed-data
+    # .ff1pkl files need no lock: each session has its own cache folder, and each worker fetches a different session.
+    http_cache = fastf1.Cache._requests_session_cached.cache
+    save_response = http_cache.save_response
+
+    def _locked_save_response(*args, **kwargs):
+        with cache_write_lock:
+            return save_response(*args, **kwargs)
+
+    http_cache.save_response = _locked_save_response
+
+def _fetch_worker(pair):
+    """
+    Runs fetch_data for one (year, event) pair inside a worker process.
+    """
+    try:
+        return fetch_data(*pair)
+    except Exception as e:
+        # Report the failure for this race instead of aborting the other workers' results
+        print(f"❌ Error fetching {pair[0]} {pair[1]}: {e}")
+        return False
+
+def fetch_many(pairs):
+    """
+    Fetches several sessions in parallel, one worker process per (year, event) pair.
+    Returns whether each pair was fetched successfully, in the order given.
+    """
+    if not pairs:
+        return []
+    cache_write_lock = multiprocessing.Lock()
+    with ProcessPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(pairs)), initializer=_init_fetch_worker, initargs=(cache_write_lock,)) as executor:
+        return list(executor.map(_fetch_worker, pairs))
+
+def get_season_events(year):
+    """
+    Lists the names of all races of a season that have already taken place.
+    """
+    schedule = fastf1.get_event_schedule(year)
+    schedule = schedule[schedule['EventDate'].dt.tz_localize(None) < datetime.datetime.now()]
+    return [name for name in schedule['EventName'] if "Testing" not in name]
+
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: python fetch_raw.py <year> <event_name>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Fetch raw F1 session data.")
+    parser.add_argument("year", type=int, nargs="?", help="The year of the race.")
+    parser.add_argument("event", type=str, nargs="?", help="The name of the event (e.g., 'Dutch Grand Prix').")
+    parser.add_argument("--season", type=int, metavar="YEAR", help=f"Fetch every completed race of this season, {MAX_FETCH_WORKERS} at a time (kept low to stay within FastF1's API rate limits).")
+    args = parser.parse_args()
+    if args.season is None and (args.year is None or args.event is None):
+        parser.error("provide <year> <event_name> or --season YEAR")
 
-    YEAR = int(sys.argv[1])
-    EVENT = sys.argv[2]
-    
     # Enable cache for fastf1
-    fastf1.Cache.enable_cache('f1_cache')
-    
-    fetch_data(YEAR, EVENT)
\ No newline at end of file
+    fastf1.Cache.enable_cache(CACHE_DIR)
+
+    if args.season is not None:
+        pairs = [(args.season, event) for event in get_season_events(args.season)]
+        failed = [event for (_, event), ok in zip(pairs, fetch_many(pairs)) if not ok]
+        if failed:
+            print(f"❌ Failed to fetch {len(failed)} of {len(pairs)} races: {', '.join(failed)}")
+            sys.exit(1)
+    else:
+        fetch_data(args.year, args.event)
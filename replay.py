@@ -3,31 +3,40 @@
 
 import sys
 import time
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pathlib import Path
+from dataclasses import dataclass
 import traceback
 import fastf1
 import datetime
 import subprocess
-import re
 import tty
 import termios
 import select
 import os
 import math
+import functools
+from numba import njit
 
 # === UTILITY FUNCTIONS ===
-def format_timedelta(td, dim=False, bold=False, color=None):
+@functools.lru_cache(maxsize=8192)
+def _format_ns_core(ns):
     """
-    Formats a pandas Timedelta object into a human-readable string.
+    Formats a non-NaT int64 nanosecond duration as M:SS.ss. Sector and lap times repeat across frames, so it is memoized.
     """
-    if pd.isna(td):
+    minutes, remainder_ns = divmod(ns, 60_000_000_000)
+    return f"{minutes}:{remainder_ns / 1e9:05.2f}"
+
+def format_timedelta(ns, dim=False, bold=False, color=None):
+    """
+    Formats an int64 nanosecond duration (see ns_array) into a human-readable string.
+    """
+    if ns == NAT_NS:
         return ""
-    seconds = td.total_seconds()
-    minutes = math.floor(seconds / 60)
-    seconds_remainder = seconds % 60
-    
-    formatted_str = f"{minutes}:{seconds_remainder:05.2f}"
+    formatted_str = _format_ns_core(int(ns))
     
     prefix = ""
     suffix = ""
@@ -38,47 +47,91 @@ def format_timedelta(td, dim=False, bold=False, color=None):
     
     return f"{prefix}{formatted_str}{suffix}"
 
-def format_gap(gap_td, prev_lap_time, is_leader):
+def format_gap(gap_ns, prev_lap_time_ns, is_leader):
     """
-    Formats the gap to the leader or interval to the car ahead.
+    Formats the gap to the leader or interval to the car ahead from int64 nanoseconds.
     """
-    if is_leader or pd.isna(gap_td):
+    if is_leader or gap_ns == NAT_NS:
         return ""
     
-    if pd.isna(prev_lap_time):
-        return f"+{gap_td.total_seconds():.1f}"
+    if prev_lap_time_ns == NAT_NS:
+        return f"+{gap_ns / 1e9:.1f}"
         
-    delta = gap_td.total_seconds()
+    delta = gap_ns / 1e9
     if delta < 1.0:
         return "DRS"
     else:
         return f"+{delta:.1f}"
 
-def get_padded_str(s, length, align='right'):
+def pad_cell(text, length, style="", align='right'):
     """
-    Pads a string to a given length, preserving ANSI color codes.
+    Pads plain text to a given length and wraps it in an ANSI style.
+    The visible width is simply len(text), so no escape codes need to be stripped to measure it.
     """
-    s_clean = re.sub(r'\x1b\[[0-9;]*m', '', s)
-    s_len = len(s_clean)
-    
-    if s_len >= length:
-        return s
-    
-    padding_needed = length - s_len
-    
+    cell = f"{style}{text}{RESET}" if style and text else text
+    padding_needed = length - len(text)
+    if padding_needed <= 0:
+        return cell
     if align == 'right':
-        return ' ' * padding_needed + s
+        return ' ' * padding_needed + cell
     else:
-        return s + ' ' * padding_needed
+        return cell + ' ' * padding_needed
+
+def make_status_timeline(times_ns, values):
+    """
+    Sorts a status log of int64 nanosecond timestamps (see ns_array) and matching values for lookup_status.
+    """
+    valid = times_ns != NAT_NS
+    times_ns, values = times_ns[valid], values[valid]
+    order = np.argsort(times_ns, kind='stable')
+    return times_ns[order], values[order]
+
+def lookup_status(status_timeline, time_ns, default):
+    """
+    Returns the latest status value at or before time_ns using a binary search, or default if there is none yet.
+    """
+    times_ns, values = status_timeline
+    idx = np.searchsorted(times_ns, time_ns, side='right') - 1
+    return values[idx] if idx >= 0 else default
+
+def ns_array(td_series):
+    """
+    Returns a Timedelta column as raw int64 nanoseconds (NaT becomes NAT_NS).
+    """
+    return td_series.to_numpy(dtype='timedelta64[ns]').view('int64')
+
+def arrow_dictionary_array(column):
+    """
+    Returns a string column as one Arrow DictionaryArray (.dictionary names, .indices codes).
+    Timelines built before the string columns were stored as categoricals hold plain strings, so those are encoded here.
+    """
+    array = column.combine_chunks()
+    if not pa.types.is_dictionary(array.type):
+        array = array.dictionary_encode()
+    return array
+
+def arrow_ns_array(duration_column):
+    """
+    Returns an Arrow duration[ns] column as raw int64 nanoseconds (nulls become NAT_NS), like ns_array.
+    """
+    return duration_column.to_numpy().view('int64')
 
 # === CONFIG & STYLING ===
 DEFAULT_PLAYBACK_SPEED = 1.0; OVERTAKE_ARROW_DURATION = pd.Timedelta(seconds=4)
 FRAME_RATE = 20.0; FRAME_DURATION = 1.0 / FRAME_RATE
+EVENT_CATCH_UP_BUDGET = FRAME_DURATION / 2; EVENT_BUDGET_CHECK_INTERVAL = 1024
 COL_WIDTHS = { "POS": 6, "DRIVER": 7, "TEAM": 13, "STATUS": 9, "PITS": 5, "TYRE": 8, "INTERVAL": 9, "GAP": 9, "S1": 9, "S2": 9, "S3": 9, "PREV_LAP": 9 }
-PROGRESS_BAR_WIDTH = 40; RETIREMENT_THRESHOLD = pd.Timedelta(seconds=120)
+NAT_NS = np.iinfo(np.int64).min # pandas' internal representation of NaT
+EV_SECTOR1, EV_SECTOR2, EV_LAP, EV_PIT_IN, EV_PIT_OUT = range(5)
+EVENT_TYPE_NAMES = ["Sector1", "Sector2", "Lap", "PitIn", "PitOut"]; EVENT_TYPE_CODES = {name: code for code, name in enumerate(EVENT_TYPE_NAMES)}
+DS_GRID, DS_RUNNING, DS_IN_PIT, DS_OUT = range(4); DISPLAY_STATUS_NAMES = ["GRID", "", "IN PIT", "OUT"]
+OVERTAKE_ARROW_NS = OVERTAKE_ARROW_DURATION.value; NO_BEST_NS = np.iinfo(np.int64).max
+BEFORE_START_NS = pd.Timedelta(seconds=-1).value # initial LastUpdateTime / PositionChangeExpiry, before any event
+PROGRESS_BAR_WIDTH = 40; RETIREMENT_THRESHOLD_NS = pd.Timedelta(seconds=120).value
 FG_WHITE = "\033[38;5;15m"; FG_BLACK = "\033[38;5;0m"; RESET = "\033[0m"; DIM = "\033[2m"; BOLD = "\033[1m"; CLEAR_SCREEN = "\033[2J\033[H"
 SECTOR_PURPLE = "\033[38;5;93m"; SECTOR_GREEN = "\033[38;5;40m"; SECTOR_YELLOW = "\033[38;5;226m"; DRS_COLOR = "\033[38;5;201m" 
 POS_GAIN_COLOR = SECTOR_GREEN; POS_LOSS_COLOR = SECTOR_PURPLE
+POSITION_ARROWS = {1: f"{POS_GAIN_COLOR}▲{RESET}", -1: f"{POS_LOSS_COLOR}▼{RESET}"}
 FLAG_GREEN_BG = "\033[48;5;22m"; FLAG_YELLOW_BG = "\033[48;5;226m"; FLAG_RED_BG = "\033[48;5;196m"
 TEAM_STYLES = { "Mercedes": ("\033[48;5;36m", FG_BLACK), "Red Bull Racing": ("\033[48;5;21m", FG_WHITE), "Ferrari": ("\033[48;5;196m", FG_WHITE), "McLaren": ("\033[48;5;208m", FG_BLACK), "Aston Martin": ("\033[48;5;28m", FG_WHITE), "Alpine": ("\033[48;5;33m", FG_WHITE), "RB": ("\033[48;5;69m", FG_WHITE), "Williams": ("\033[48;5;27m", FG_WHITE), "Kick Sauber": ("\033[48;5;40m", FG_BLACK), "Stake F1 Team Kick Sauber": ("\033[48;5;40m", FG_BLACK), "Haas F1 Team": ("\033[48;5;242m", FG_WHITE), "Racing Bulls": ("\033[48;5;69m", FG_WHITE) }
 TYRE_COLORS = { "S": "\033[38;5;196m", "M": "\033[38;5;226m", "H": "\033[38;5;255m", "I": "\033[38;5;40m", "W": "\033[38;5;33m" }
@@ -86,6 +139,65 @@ SHORT_TEAM_NAMES = { "Red Bull Racing": "Red Bull", "Stake F1 Team Kick Sauber":
 SHORT_TYRE_NAMES = { "SOFT": "S", "MEDIUM": "M", "HARD": "H", "INTERMEDIATE": "I", "WET": "W", }
 TRACK_STATUS_MAP = { '1': (FLAG_GREEN_BG, FG_BLACK, "TRACK CLEAR"), '2': (FLAG_YELLOW_BG, FG_BLACK, "YELLOW FLAG"), '4': (FLAG_YELLOW_BG, FG_BLACK, "SAFETY CAR"), '5': (FLAG_RED_BG, FG_WHITE, "RED FLAG"), '6': (FLAG_YELLOW_BG, FG_BLACK, "VSC DEPLOYED"), '7': (FLAG_GREEN_BG, FG_BLACK, "VSC ENDING"), }
 
+# Screen pieces that never change between frames, built once
+HEADER_LINE = (
+    f"{'':<{COL_WIDTHS['POS']}}"
+    f"{'DRIVER':<{COL_WIDTHS['DRIVER']}}"
+    f"{'TEAM':<{COL_WIDTHS['TEAM']}}"
+    f"{'STATUS':<{COL_WIDTHS['STATUS']}}"
+    f"{'PITS':<{COL_WIDTHS['PITS']}}"
+    f"{'TYRE':<{COL_WIDTHS['TYRE']}}"
+    f"{'INTERVAL':<{COL_WIDTHS['INTERVAL']}}"
+    f"{'GAP':<{COL_WIDTHS['GAP']}}"
+    f"{'S1':<{COL_WIDTHS['S1']}}"
+    f"{'S2':<{COL_WIDTHS['S2']}}"
+    f"{'S3':<{COL_WIDTHS['S3']}}"
+    f"{'PREV LAP':<{COL_WIDTHS['PREV_LAP']}}"
+)
+SEPARATOR_LINE = "-" * len(HEADER_LINE)
+CONTROLS_LINE = "P/Space: Pause | ↑/↓: Speed | ←/→: Skip Lap | 1: 1x | N: Sync Next Lap | Q: Quit"
+CONTROLS_LINE_WIDTH = len(CONTROLS_LINE) # plain text, so its visible width is its length
+PROGRESS_BARS = ['█' * filled + '░' * (PROGRESS_BAR_WIDTH - filled) for filled in range(PROGRESS_BAR_WIDTH + 1)]
+TIMING_BLANK = " " * sum(COL_WIDTHS[k] for k in ['INTERVAL', 'GAP', 'S1', 'S2', 'S3', 'PREV_LAP'])
+TYRE_AND_TIMING_BLANK = " " * (COL_WIDTHS['PITS'] + COL_WIDTHS['TYRE']) + TIMING_BLANK
+
+# === CELL CACHES ===
+# Team, tyre and status cells only depend on a few small values, so each styled and padded cell is built once and reused every frame
+_TEAM_CELL_CACHE = {}
+_TYRE_CELL_CACHE = {}
+_STATUS_CELL_CACHE = {}
+
+def get_team_cell(team_name):
+    cell = _TEAM_CELL_CACHE.get(team_name)
+    if cell is None:
+        display_team = SHORT_TEAM_NAMES.get(team_name, team_name)
+        bg, fg = TEAM_STYLES.get(team_name, ("", ""))
+        padding = " " * (COL_WIDTHS['TEAM'] - len(display_team))
+        cell = _TEAM_CELL_CACHE[team_name] = f"{bg}{fg}{display_team}{padding}{RESET}"
+    return cell
+
+def make_driver_cells(drivers, driver_teams):
+    """
+    Builds each driver's abbreviation and team cells as one string. A driver's team never changes during a session,
+    so these are built once per replay rather than looked up and padded every frame.
+    """
+    return [f"{drv}".ljust(COL_WIDTHS['DRIVER']) + get_team_cell(driver_teams.get(drv, "Unknown")) for drv in drivers]
+
+def get_tyre_cell(display_compound, tyre_life):
+    key = (display_compound, tyre_life)
+    cell = _TYRE_CELL_CACHE.get(key)
+    if cell is None:
+        tyre_color = TYRE_COLORS.get(display_compound, "")
+        tyre_text = f"{display_compound:<2} [{tyre_life:>2}]"
+        cell = _TYRE_CELL_CACHE[key] = pad_cell(tyre_text, COL_WIDTHS['TYRE'], tyre_color)
+    return cell
+
+def get_status_cell(display_status):
+    cell = _STATUS_CELL_CACHE.get(display_status)
+    if cell is None:
+        cell = _STATUS_CELL_CACHE[display_status] = pad_cell(display_status, COL_WIDTHS['STATUS'], BOLD)
+    return cell
+
 # === MENU & ORCHESTRATION ===
 def get_race_schedule(year):
     print(f"Fetching {year} race schedule...")
@@ -96,9 +208,11 @@ def check_race_status(year, event_name):
     event_name_safe = event_name.replace(' ', '_')
     raw_path = Path(f"raw_data/{year}_{event_name_safe}")
     processed_path = Path(f"processed_data/{year}_{event_name_safe}_timeline.parquet")
-    if processed_path.exists():
+    # The replay also reads the raw results, and races fetched before the switch to Parquet only have .pkl files,
+    # so those are reported as not downloaded and go back through fetch and build
+    if processed_path.exists() and (raw_path / "results.parquet").exists():
         return f"{SECTOR_GREEN}Processed{RESET}"
-    if raw_path.exists() and (raw_path / "laps.pkl").exists():
+    if raw_path.exists() and (raw_path / "laps.parquet").exists():
         return f"{SECTOR_YELLOW}Raw Data{RESET}"
     return f"{DIM}Not Downloaded{RESET}"
 
@@ -123,35 +237,155 @@ def run_script(script_name, year, event_name):
         print(f"❌ An error occurred while running {script_name}: {e}")
         return False
 
+ARROW_KEYS = {b'[A': 'up', b'[B': 'down', b'[C': 'right', b'[D': 'left'}
+# Bytes read from stdin but not yet returned as keys, so a read that picks up several key presses loses none of them
+_PENDING_INPUT = bytearray()
+
 def get_user_input():
-    if not select.select([sys.stdin], [], [], 0)[0]:
+    """
+    Returns the next key pressed, or None. Expects the terminal to be in polling mode (VMIN=0, see run_replay's caller).
+    """
+    _PENDING_INPUT.extend(os.read(sys.stdin.fileno(), 64))
+    if not _PENDING_INPUT or _PENDING_INPUT in (b'\x1b', b'\x1b['):
+        # Nothing waiting, or the rest of an escape sequence has not arrived yet
         return None
-    char = sys.stdin.read(1)
-    if char == '\x1b':
-        seq = sys.stdin.read(2)
-        if seq == '[A':
-            return 'up'
-        if seq == '[B':
-            return 'down'
-        if seq == '[C':
-            return 'right'
-        if seq == '[D':
-            return 'left'
-    return char
+    if _PENDING_INPUT[:1] == b'\x1b' and bytes(_PENDING_INPUT[1:3]) in ARROW_KEYS:
+        key = ARROW_KEYS[bytes(_PENDING_INPUT[1:3])]
+        del _PENDING_INPUT[:3]
+        return key
+    key = _PENDING_INPUT[:1].decode(errors='replace')
+    del _PENDING_INPUT[:1]
+    return key
+
+def wait_for_input(deadline):
+    """
+    Waits until the time.monotonic() deadline, returning early as soon as a key press is waiting on stdin.
+    """
+    remaining = deadline - time.monotonic()
+    if remaining > 0:
+        select.select([sys.stdin], [], [], remaining)
 
 # === REPLAY ENGINE ===
 
-def draw_leaderboard(year, event_name, driver_state, sorted_drivers, driver_teams, race_laps, total_laps, current_race_time, best_times, status_info, playback_info):
-    """Draws the entire screen based on the current state."""
-    leader = sorted_drivers[0]
-    leader_state = driver_state[leader]
-    screen_content = [CLEAR_SCREEN]
+@njit(cache=True)
+def advance_events(event_times_ns, event_driver_idx, event_type_codes, event_positions, event_laps, event_s1_ns, event_s2_ns, event_s3_ns, event_lap_times_ns,
+                   start, stop,
+                   positions, last_event_laps, last_event_index, display_codes, pit_stops, sectors_ns, prev_sectors_ns, prev_lap_times_ns, position_change, position_change_expiry_ns, best_sectors_ns, touched):
+    """
+    Applies timeline events [start, stop) to the per-driver state arrays.
+    """
+    for i in range(start, stop):
+        d = event_driver_idx[i]
+        event_type = event_type_codes[i]
+        new_pos = event_positions[i]
+        lap = event_laps[i]
+        if new_pos != positions[d] and last_event_laps[d] > 1:
+            position_change[d] = 1 if new_pos < positions[d] else -1
+            position_change_expiry_ns[d] = event_times_ns[i] + OVERTAKE_ARROW_NS
+        positions[d] = new_pos
+        if event_type == EV_PIT_IN:
+            display_codes[d] = DS_IN_PIT
+        elif event_type == EV_PIT_OUT:
+            display_codes[d] = DS_OUT
+            pit_stops[d] += 1
+        elif event_type == EV_SECTOR1 and (display_codes[d] == DS_OUT or display_codes[d] == DS_GRID):
+            display_codes[d] = DS_RUNNING
+        if lap > last_event_laps[d]:
+            prev_sectors_ns[d, 1], prev_sectors_ns[d, 2] = sectors_ns[d, 1], sectors_ns[d, 2]
+            sectors_ns[d, 0], sectors_ns[d, 1], sectors_ns[d, 2] = NAT_NS, NAT_NS, NAT_NS
+        last_event_laps[d] = lap
+        last_event_index[d] = i
+        sector = -1
+        if event_type == EV_SECTOR1:
+            sector, sector_ns = 0, event_s1_ns[i]
+        elif event_type == EV_SECTOR2:
+            sector, sector_ns = 1, event_s2_ns[i]
+        elif event_type == EV_LAP:
+            sector, sector_ns = 2, event_s3_ns[i]
+            prev_lap_times_ns[d] = event_lap_times_ns[i]
+        if sector >= 0:
+            sectors_ns[d, sector] = sector_ns
+            if sector_ns != NAT_NS and sector_ns < best_sectors_ns[sector]:
+                best_sectors_ns[sector] = sector_ns
+        touched[d] = True
+
+@dataclass
+class DriverStates:
+    """
+    The replay state of every driver as parallel arrays indexed like `drivers`.
+    advance_events updates the fields up to `touched` in place; the rest are copied from each driver's latest event.
+    """
+    positions: np.ndarray
+    last_event_laps: np.ndarray
+    last_event_index: np.ndarray
+    display_codes: np.ndarray
+    pit_stops: np.ndarray
+    sectors_ns: np.ndarray
+    prev_sectors_ns: np.ndarray
+    prev_lap_times_ns: np.ndarray
+    position_change: np.ndarray
+    position_change_expiry_ns: np.ndarray
+    best_sectors_ns: np.ndarray # fastest S1/S2/S3 of the session so far, shared by all drivers
+    touched: np.ndarray
+    laps: np.ndarray
+    compounds: np.ndarray
+    tyre_lives: np.ndarray
+    gaps_ns: np.ndarray
+    intervals_ns: np.ndarray
+    last_event_types: np.ndarray
+    last_update_ns: np.ndarray
+    personal_bests: np.ndarray
+    statuses: list # 'On Track' until the driver finishes or retires
+
+    @classmethod
+    def on_grid(cls, grid_positions, starting_compounds):
+        """Returns the state of drivers lined up on the grid before the first event."""
+        n_drivers = len(grid_positions)
+        return cls(
+            positions=np.array(grid_positions, dtype=np.float64), last_event_laps=np.zeros(n_drivers), last_event_index=np.full(n_drivers, -1, dtype=np.int64),
+            display_codes=np.full(n_drivers, DS_GRID, dtype=np.int8), pit_stops=np.zeros(n_drivers, dtype=np.int64),
+            sectors_ns=np.full((n_drivers, 3), NAT_NS, dtype=np.int64), prev_sectors_ns=np.full((n_drivers, 3), NAT_NS, dtype=np.int64), prev_lap_times_ns=np.full(n_drivers, NAT_NS, dtype=np.int64),
+            position_change=np.zeros(n_drivers, dtype=np.int8), position_change_expiry_ns=np.full(n_drivers, BEFORE_START_NS, dtype=np.int64),
+            best_sectors_ns=np.full(3, NO_BEST_NS, dtype=np.int64), touched=np.zeros(n_drivers, dtype=np.bool_),
+            laps=np.zeros(n_drivers), compounds=np.array(starting_compounds, dtype=object), tyre_lives=np.ones(n_drivers),
+            gaps_ns=np.full(n_drivers, NAT_NS, dtype=np.int64), intervals_ns=np.full(n_drivers, NAT_NS, dtype=np.int64),
+            last_event_types=np.full(n_drivers, -1, dtype=np.int8), last_update_ns=np.full(n_drivers, BEFORE_START_NS, dtype=np.int64),
+            personal_bests=np.zeros((n_drivers, 3), dtype=np.bool_), statuses=["On Track"] * n_drivers,
+        )
+
+    def kernel_arrays(self):
+        """Returns the arrays advance_events mutates, in its argument order."""
+        return (self.positions, self.last_event_laps, self.last_event_index, self.display_codes, self.pit_stops, self.sectors_ns, self.prev_sectors_ns,
+                self.prev_lap_times_ns, self.position_change, self.position_change_expiry_ns, self.best_sectors_ns, self.touched)
+
+# Rows as last written to the terminal, so each frame only rewrites the rows that changed
+_PREVIOUS_FRAME_LINES = []
+
+def write_frame(lines):
+    """Writes the screen rows that differ from the previous frame in one write (the whole screen on the first frame)."""
+    out = []
+    if not _PREVIOUS_FRAME_LINES:
+        out.append(CLEAR_SCREEN)
+    for row, line in enumerate(lines):
+        if row >= len(_PREVIOUS_FRAME_LINES) or _PREVIOUS_FRAME_LINES[row] != line:
+            out.append(f"\033[{row + 1};1H{line}\033[K")
+    if len(lines) < len(_PREVIOUS_FRAME_LINES):
+        out.append(f"\033[{len(lines) + 1};1H\033[J")
+    # Leave the cursor at the end of the last row (always the controls line), as a full redraw would
+    out.append(f"\033[{len(lines)};{CONTROLS_LINE_WIDTH + 1}H")
+    _PREVIOUS_FRAME_LINES[:] = lines
+    sys.stdout.buffer.write("".join(out).encode()); sys.stdout.flush()
+
+def draw_leaderboard(year, event_name, states, sorted_order, driver_cells, race_laps, total_laps, current_race_time_ns, status_info, playback_info):
+    """Draws the entire screen based on the current state. sorted_order lists driver indices in running order."""
+    leader = sorted_order[0]
+    screen_content = [""] # blank top margin row
     is_paused, playback_speed = playback_info
     
     # --- 1. Draw Header ---
     pause_str = f"| {BOLD}{SECTOR_YELLOW}[PAUSED]{RESET} " if is_paused else ""
     speed_str = f"| Speed: {playback_speed:.2f}x"
-    header_time = "RACE STARTING" if current_race_time is None else f"Time: {format_timedelta(current_race_time)}"
+    header_time = "RACE STARTING" if current_race_time_ns is None else f"Time: {format_timedelta(current_race_time_ns)}"
     title_line = f"{BOLD}{year} {event_name} | Lap {race_laps}/{total_laps} | {header_time}{RESET} {pause_str}{speed_str}"
     screen_content.append(title_line)
 
@@ -170,199 +404,194 @@ def draw_leaderboard(year, event_name, driver_state, sorted_drivers, driver_team
     screen_content.append(" | ".join(status_line_parts))
 
     completed_laps = max(0, race_laps - 1)
-    if leader_state['Status'] != 'On Track':
+    if states.statuses[leader] != 'On Track':
         progress_percent = 1.0
     else:
         progress_percent = (completed_laps / total_laps if total_laps > 0 else 0)
-    filled_width = int(progress_percent * PROGRESS_BAR_WIDTH)
-    bar = '█' * filled_width + '░' * (PROGRESS_BAR_WIDTH - filled_width)
-    progress_line = f"Progress: [{bar}] {progress_percent:.1%}"
+    progress_line = f"Progress: [{PROGRESS_BARS[int(progress_percent * PROGRESS_BAR_WIDTH)]}] {progress_percent:.1%}"
     screen_content.append(progress_line)
     
-    header_line = (
-        f"{'':<{COL_WIDTHS['POS']}}"
-        f"{'DRIVER':<{COL_WIDTHS['DRIVER']}}"
-        f"{'TEAM':<{COL_WIDTHS['TEAM']}}"
-        f"{'STATUS':<{COL_WIDTHS['STATUS']}}"
-        f"{'PITS':<{COL_WIDTHS['PITS']}}"
-        f"{'TYRE':<{COL_WIDTHS['TYRE']}}"
-        f"{'INTERVAL':<{COL_WIDTHS['INTERVAL']}}"
-        f"{'GAP':<{COL_WIDTHS['GAP']}}"
-        f"{'S1':<{COL_WIDTHS['S1']}}"
-        f"{'S2':<{COL_WIDTHS['S2']}}"
-        f"{'S3':<{COL_WIDTHS['S3']}}"
-        f"{'PREV LAP':<{COL_WIDTHS['PREV_LAP']}}"
-    )
-    screen_content.append(header_line)
-    screen_content.append("-" * len(header_line))
+    screen_content.append(HEADER_LINE)
+    screen_content.append(SEPARATOR_LINE)
 
     # --- 2. Draw Driver Lines (REFACTORED FOR CLARITY) ---
-    for i, drv in enumerate(sorted_drivers):
-        state = driver_state[drv]
+    best_s1, best_s2, best_s3 = states.best_sectors_ns
+    leader_s3 = states.sectors_ns[leader, 2]
+    for i, di in enumerate(sorted_order):
         parts = []
+        status = states.statuses[di]
+        on_track = status == 'On Track'
 
         # Each column is now built and padded independently
-        pos_num_str = 'NC' if state['Status'] != 'On Track' else f"{int(state['Position']):>2}"
-        arrow = state['PositionChangeSymbol'] if current_race_time is not None and current_race_time < state['PositionChangeExpiry'] else ''
-        pos_str = f"{pos_num_str} {arrow}"
-        parts.append(get_padded_str(pos_str, COL_WIDTHS['POS']))
+        pos_num_str = 'NC' if not on_track else f"{int(states.positions[di]):>2}"
+        arrow = POSITION_ARROWS.get(states.position_change[di], '') if current_race_time_ns is not None and current_race_time_ns < states.position_change_expiry_ns[di] else ''
+        pos_width = len(pos_num_str) + 1 + (1 if arrow else 0) # the arrow is a single coloured character
+        parts.append(' ' * max(0, COL_WIDTHS['POS'] - pos_width) + f"{pos_num_str} {arrow}")
         
-        parts.append(f"{drv}".ljust(COL_WIDTHS['DRIVER']))
-        
-        team_name = driver_teams.get(drv, "Unknown")
-        display_team = SHORT_TEAM_NAMES.get(team_name, team_name)
-        bg, fg = TEAM_STYLES.get(team_name, ("", ""))
-        padding = " " * (COL_WIDTHS['TEAM'] - len(display_team))
-        parts.append(f"{bg}{fg}{display_team}{padding}{RESET}")
+        parts.append(driver_cells[di])
         
-        display_status = state['DisplayStatus']
-        if state['Status'] != 'On Track':
-            display_status = state['Status']
-        parts.append(get_padded_str(f"{BOLD}{display_status}{RESET}", COL_WIDTHS['STATUS']))
+        display_code = states.display_codes[di]
+        parts.append(get_status_cell(DISPLAY_STATUS_NAMES[display_code] if on_track else status))
         
-        if state['Status'] == 'On Track' and display_status != 'GRID':
-            pit_stops = state['PitStops']
+        if on_track and display_code != DS_GRID:
+            pit_stops = states.pit_stops[di]
             pits_str = f"[{pit_stops}]" if pit_stops > 0 else ""
             parts.append(pits_str.ljust(COL_WIDTHS['PITS']))
             
-            compound = str(state['Compound']).upper()
+            compound = str(states.compounds[di]).upper()
             display_compound = SHORT_TYRE_NAMES.get(compound, "?")
-            tyre_color = TYRE_COLORS.get(display_compound, "")
-            tyre_life = int(state['TyreLife']) if pd.notna(state['TyreLife']) else 0
-            tyre_text = f"{display_compound:<2} [{tyre_life:>2}]"
-            parts.append(get_padded_str(f"{tyre_color}{tyre_text}{RESET}", COL_WIDTHS['TYRE']))
+            tyre_life = 0 if math.isnan(states.tyre_lives[di]) else int(states.tyre_lives[di])
+            parts.append(get_tyre_cell(display_compound, tyre_life))
             
-            if state['LastEventLap'] < 2:
-                blank_width = sum(COL_WIDTHS[k] for k in ['INTERVAL', 'GAP', 'S1', 'S2', 'S3', 'PREV_LAP'])
-                parts.append(" " * blank_width)
+            if states.last_event_laps[di] < 2:
+                parts.append(TIMING_BLANK)
             else:
-                interval_td = state['Interval']
-                interval_str = format_timedelta(interval_td)
-                drs_is_active = drs_allowed and pd.notna(interval_td) and interval_td.total_seconds() < 1.0
-                if drs_is_active:
-                    interval_str = f"{DRS_COLOR}{interval_str}{RESET}"
-                parts.append(get_padded_str(interval_str, COL_WIDTHS['INTERVAL']))
+                interval_ns = states.intervals_ns[di]
+                drs_is_active = drs_allowed and interval_ns != NAT_NS and interval_ns < 1_000_000_000
+                parts.append(pad_cell(format_timedelta(interval_ns), COL_WIDTHS['INTERVAL'], DRS_COLOR if drs_is_active else ""))
                 
-                gap_str = format_gap(state['GapToLeader'], leader_state.get('S3', pd.NaT), i == 0)
+                gap_str = format_gap(states.gaps_ns[di], leader_s3, i == 0)
                 parts.append(gap_str.ljust(COL_WIDTHS['GAP']))
                 
-                best_s1, best_s2, best_s3 = best_times
-                s1_color = SECTOR_PURPLE if state['S1'] == best_s1 and pd.notna(state['S1']) else SECTOR_GREEN if state['IsPersonalBestS1'] else SECTOR_YELLOW
-                s2_color = SECTOR_PURPLE if state['S2'] == best_s2 and pd.notna(state['S2']) else SECTOR_GREEN if state['IsPersonalBestS2'] else SECTOR_YELLOW
-                s3_color = SECTOR_PURPLE if state['S3'] == best_s3 and pd.notna(state['S3']) else SECTOR_GREEN if state['IsPersonalBestS3'] else SECTOR_YELLOW
+                s1_ns, s2_ns, s3_ns = states.sectors_ns[di]
+                _, prev_s2_ns, prev_s3_ns = states.prev_sectors_ns[di]
+                pb_s1, pb_s2, pb_s3 = states.personal_bests[di]
+                s1_color = SECTOR_PURPLE if s1_ns == best_s1 and s1_ns != NAT_NS else SECTOR_GREEN if pb_s1 else SECTOR_YELLOW
+                s2_color = SECTOR_PURPLE if s2_ns == best_s2 and s2_ns != NAT_NS else SECTOR_GREEN if pb_s2 else SECTOR_YELLOW
+                s3_color = SECTOR_PURPLE if s3_ns == best_s3 and s3_ns != NAT_NS else SECTOR_GREEN if pb_s3 else SECTOR_YELLOW
                 
-                s1_str, s2_str, s3_str = "", "", ""
-                event_type = state['LastEventType']
-                if event_type == 'Sector1':
-                    s1_str = format_timedelta(state['S1'], color=s1_color, bold=True)
-                    s2_str = format_timedelta(state['Prev_S2'], dim=True)
-                    s3_str = format_timedelta(state['Prev_S3'], dim=True)
-                elif event_type == 'Sector2':
-                    s1_str = format_timedelta(state['S1'], color=s1_color)
-                    s2_str = format_timedelta(state['S2'], color=s2_color, bold=True)
-                    s3_str = format_timedelta(state['Prev_S3'], dim=True)
-                elif event_type == 'Lap':
-                    s1_str = format_timedelta(state['S1'], color=s1_color)
-                    s2_str = format_timedelta(state['S2'], color=s2_color)
-                    s3_str = format_timedelta(state['S3'], color=s3_color, bold=True)
-
-                parts.append(get_padded_str(s1_str, COL_WIDTHS['S1']))
-                parts.append(get_padded_str(s2_str, COL_WIDTHS['S2']))
-                parts.append(get_padded_str(s3_str, COL_WIDTHS['S3']))
+                # Each sector is kept as (plain text, style) so it can be padded without measuring escape codes
+                s1, s2, s3 = ("", ""), ("", ""), ("", "")
+                event_type = states.last_event_types[di]
+                if event_type == EV_SECTOR1:
+                    s1 = (format_timedelta(s1_ns), s1_color + BOLD)
+                    s2 = (format_timedelta(prev_s2_ns), DIM)
+                    s3 = (format_timedelta(prev_s3_ns), DIM)
+                elif event_type == EV_SECTOR2:
+                    s1 = (format_timedelta(s1_ns), s1_color)
+                    s2 = (format_timedelta(s2_ns), s2_color + BOLD)
+                    s3 = (format_timedelta(prev_s3_ns), DIM)
+                elif event_type == EV_LAP:
+                    s1 = (format_timedelta(s1_ns), s1_color)
+                    s2 = (format_timedelta(s2_ns), s2_color)
+                    s3 = (format_timedelta(s3_ns), s3_color + BOLD)
+
+                parts.append(pad_cell(s1[0], COL_WIDTHS['S1'], s1[1]))
+                parts.append(pad_cell(s2[0], COL_WIDTHS['S2'], s2[1]))
+                parts.append(pad_cell(s3[0], COL_WIDTHS['S3'], s3[1]))
                 
-                prev_lap_str = format_timedelta(state['PreviousLapTime'])
-                parts.append(get_padded_str(prev_lap_str, COL_WIDTHS['PREV_LAP']))
+                parts.append(pad_cell(format_timedelta(states.prev_lap_times_ns[di]), COL_WIDTHS['PREV_LAP']))
         else:
-            if display_status == "GRID":
+            if on_track: # still on the grid
                 parts.append(''.ljust(COL_WIDTHS['PITS']))
-                compound = str(state.get('Compound', '?')).upper()
+                compound = str(states.compounds[di]).upper()
                 display_compound = SHORT_TYRE_NAMES.get(compound, "?")
-                tyre_color = TYRE_COLORS.get(display_compound, "")
-                tyre_life = int(state.get('TyreLife', 0))
-                tyre_text = f"{display_compound:<2} [{tyre_life:>2}]"
-                parts.append(get_padded_str(f"{tyre_color}{tyre_text}{RESET}", COL_WIDTHS['TYRE']))
+                parts.append(get_tyre_cell(display_compound, int(states.tyre_lives[di])))
 
-            blank_width = sum(COL_WIDTHS[k] for k in ['INTERVAL', 'GAP', 'S1', 'S2', 'S3', 'PREV_LAP'])
-            if display_status != "GRID":
-                blank_width += COL_WIDTHS['PITS'] + COL_WIDTHS['TYRE']
-            parts.append(" " * blank_width)
+            parts.append(TIMING_BLANK if on_track else TYRE_AND_TIMING_BLANK)
 
         screen_content.append("".join(parts))
     
     # Footer
-    screen_content.append("-" * len(header_line))
-    controls_str = "P/Space: Pause | ↑/↓: Speed | ←/→: Skip Lap | 1: 1x | N: Sync Next Lap | Q: Quit"
-    screen_content.append(controls_str)
+    screen_content.append(SEPARATOR_LINE)
+    screen_content.append(CONTROLS_LINE)
     
-    sys.stdout.write("\n".join(screen_content)); sys.stdout.flush()
+    write_frame(screen_content)
 
 def run_replay(year, event_name, playback_speed):
+    _PREVIOUS_FRAME_LINES.clear()
     event_name_safe = event_name.replace(" ", "_")
     BASE_PATH = Path(__file__).parent
     DATA_FILE = BASE_PATH / f"processed_data/{year}_{event_name_safe}_timeline.parquet"
     RAW_DATA_FOLDER = BASE_PATH / f"raw_data/{year}_{event_name_safe}"
+    first_event_time = pd.Timedelta(0)
     try:
-        timeline_df = pd.read_parquet(DATA_FILE)
-        if not timeline_df.empty:
-            first_event_time = timeline_df['Time'].iloc[0]
-            timeline_df['Time'] = timeline_df['Time'] - first_event_time
-        results_df = pd.read_pickle(RAW_DATA_FOLDER / "results.pkl")
-        laps_df = pd.read_pickle(RAW_DATA_FOLDER / "laps.pkl")
+        # Read straight into Arrow columns (no intermediate DataFrame); memory_map only saves copying the compressed file
+        # bytes, the pages are still decompressed into new buffers. Arrow to NumPy is then zero-copy for null-free numeric columns.
+        timeline = pq.read_table(DATA_FILE, memory_map=True).unify_dictionaries()
+        event_times_ns = arrow_ns_array(timeline['Time'])
+        if len(event_times_ns):
+            first_event_time = pd.Timedelta(event_times_ns[0])
+            event_times_ns = event_times_ns - event_times_ns[0]
+        results_df = pd.read_parquet(RAW_DATA_FOLDER / "results.parquet")
+        laps_df = pd.read_parquet(RAW_DATA_FOLDER / "laps.parquet")
         drivers = results_df['Abbreviation'].tolist()
-        driver_teams = dict(zip(results_df['Abbreviation'], results_df['TeamName']))
         
         try:
-            track_status_df = pd.read_pickle(RAW_DATA_FOLDER / "track_status.pkl")
+            track_status_df = pd.read_parquet(RAW_DATA_FOLDER / "track_status.parquet")
         except FileNotFoundError:
             track_status_df = pd.DataFrame()
         try:
-            weather_df = pd.read_pickle(RAW_DATA_FOLDER / "weather_data.pkl")
+            weather_df = pd.read_parquet(RAW_DATA_FOLDER / "weather_data.parquet")
         except FileNotFoundError:
             weather_df = pd.DataFrame()
         try:
-            race_control_df = pd.read_pickle(RAW_DATA_FOLDER / "race_control.pkl")
+            race_control_df = pd.read_parquet(RAW_DATA_FOLDER / "race_control.parquet")
         except FileNotFoundError:
             race_control_df = pd.DataFrame()
 
     except FileNotFoundError as e:
-        print(f"❌ Error: Could not load data file: {e.filename}")
+        print(f"❌ Error: Could not load data file: {e.filename or DATA_FILE}")
         return
     
-    # Pre-process Race Control messages to create a DRS timeline
-    drs_status_df = pd.DataFrame()
+    # Sorted status timelines so each frame can find the active status with a binary search instead of a full scan
+    no_status = (np.array([], dtype=np.int64), np.array([]))
+    track_status_timeline = make_status_timeline(ns_array(track_status_df['Time'] - first_event_time), track_status_df['Status'].astype(str).to_numpy()) if not track_status_df.empty else no_status
+    weather_timeline = make_status_timeline(ns_array(weather_df['Time'] - first_event_time), (weather_df['Rainfall'] == True).to_numpy()) if not weather_df.empty else no_status
+
+    # DRS starts disabled and is toggled by race control messages mentioning DRS
+    drs_timeline = no_status
     if not race_control_df.empty:
-        drs_messages = race_control_df[race_control_df['Message'].str.contains("DRS", na=False)].copy()
+        drs_messages = race_control_df[race_control_df['Message'].str.contains("DRS", na=False)]
         if not drs_messages.empty:
-            drs_messages['Time'] = drs_messages['Time'] - first_event_time
-            drs_status_df = drs_messages[['Time']].copy()
-            drs_status_df['DRS_Status'] = drs_messages['Message'].str.contains("ENABLED", case=False, na=False)
-            initial_state_df = pd.DataFrame([{'Time': pd.Timedelta(seconds=0), 'DRS_Status': False}])
-            drs_status_df = pd.concat([initial_state_df, drs_status_df], ignore_index=True)
-            drs_status_df.sort_values(by='Time', inplace=True)
+            drs_times_ns = np.concatenate(([0], ns_array(drs_messages['Time'] - first_event_time)))
+            drs_enabled = np.concatenate(([False], drs_messages['Message'].str.contains("ENABLED", case=False, na=False).to_numpy(dtype=bool)))
+            drs_timeline = make_status_timeline(drs_times_ns, drs_enabled)
 
     lap1_laps = laps_df.loc[laps_df['LapNumber'] == 1]
     starting_compounds = dict(zip(lap1_laps['Driver'], lap1_laps['Compound']))
-    driver_state = {}
-    starting_grid = results_df.sort_values(by='GridPosition')
-    for i, driver_row in starting_grid.iterrows():
-        drv = driver_row['Abbreviation']
-        driver_state[drv] = {
-            "Position": driver_row['GridPosition'], "PreviousPosition": driver_row['GridPosition'], "LapNumber": 0, "Compound": starting_compounds.get(drv, "?"), "TyreLife": 1, "GapToLeader": pd.NaT, "Interval": pd.NaT, "Status": "On Track", "DisplayStatus": "GRID", "LastEventType": "", "LastEventLap": 0, "PitStops": 0, "S1": pd.NaT, "S2": pd.NaT, "S3": pd.NaT, "Prev_S2": pd.NaT, "Prev_S3": pd.NaT, "PreviousLapTime": pd.NaT, "LastUpdateTime": pd.Timedelta(seconds=-1), 'IsPersonalBestS1': False, 'IsPersonalBestS2': False, 'IsPersonalBestS3': False, 'PositionChangeSymbol': '', 'PositionChangeExpiry': pd.Timedelta(seconds=-1)
-        }
+    driver_teams, final_status_by_driver = {}, {}
+    # One pass over plain column values builds every per-driver lookup (no per-row Series as with iterrows)
+    for drv, team_name, final_status in zip(results_df['Abbreviation'], results_df['TeamName'], results_df['Status']):
+        driver_teams[drv] = team_name
+        final_status_by_driver[drv] = final_status
+    # `drivers` follows the results order, so the grid positions can be taken column-wise
+    states = DriverStates.on_grid(results_df['GridPosition'].to_numpy(), [starting_compounds.get(drv, "?") for drv in drivers])
     
     try:
-        event_index, timeline_events = 0, timeline_df.to_dict('records')
-        total_events, total_laps = len(timeline_events), int(timeline_df['LapNumber'].max())
+        event_index, total_events = 0, len(event_times_ns)
         if total_events == 0:
             print("❌ Timeline file contains no events.")
             return
-        best_s1_so_far, best_s2_so_far, best_s3_so_far = pd.Timedelta.max, pd.Timedelta.max, pd.Timedelta.max
-        draw_leaderboard(year, event_name, driver_state, drivers, driver_teams, 0, total_laps, None, (None, None, None), ('1', False, False), (False, playback_speed))
-        time.sleep(5)
+        # Keep the timeline as one typed array per column (indexed by event_index) rather than a dict per event
+        event_drivers = arrow_dictionary_array(timeline['Driver'])
+        event_driver_names, event_driver_codes = event_drivers.dictionary.to_pylist(), event_drivers.indices.to_numpy()
+        event_types = arrow_dictionary_array(timeline['EventType'])
+        event_type_codes = np.array([EVENT_TYPE_CODES[name] for name in event_types.dictionary.to_pylist()], dtype=np.int8)[event_types.indices.to_numpy()]
+        event_gaps_ns, event_intervals_ns = arrow_ns_array(timeline['GapToLeader']), arrow_ns_array(timeline['Interval'])
+        event_s1_ns, event_s2_ns, event_s3_ns, event_lap_times_ns = arrow_ns_array(timeline['Sector1Time']), arrow_ns_array(timeline['Sector2Time']), arrow_ns_array(timeline['Sector3Time']), arrow_ns_array(timeline['LapTime'])
+        event_positions, event_laps, event_tyre_lives = timeline['Position'].to_numpy(), timeline['LapNumber'].to_numpy(), timeline['TyreLife'].to_numpy()
+        total_laps = int(np.nanmax(event_laps))
+        event_compounds = timeline['Compound'].to_numpy()
+        event_personal_bests = np.column_stack([timeline[f'IsPersonalBestS{n}'].to_numpy() for n in (1, 2, 3)])
+        event_driver_idx = np.array([drivers.index(name) for name in event_driver_names], dtype=np.int64)[event_driver_codes]
+        timeline_arrays = (event_times_ns, event_driver_idx, event_type_codes, event_positions, event_laps, event_s1_ns, event_s2_ns, event_s3_ns, event_lap_times_ns)
+
+        driver_cells = make_driver_cells(drivers, driver_teams)
+        n_drivers = len(drivers)
+        draw_leaderboard(year, event_name, states, list(range(n_drivers)), driver_cells, 0, total_laps, None, ('1', False, False), (False, playback_speed))
+        # Compile (or load the cached) kernel while the starting grid is on screen rather than on the first frame,
+        # and count the compile time as part of the start-up pause
+        pause_start = time.monotonic()
+        advance_events(*timeline_arrays, 0, 0, *states.kernel_arrays())
+        time.sleep(max(0.0, 5 - (time.monotonic() - pause_start)))
         
-        current_race_time = timeline_events[0]['Time']
+        current_race_time = pd.Timedelta(event_times_ns[0])
         is_paused = False
+        order_dirty = True
         last_frame_time = time.monotonic()
+        # Frames are paced against absolute deadlines so per-frame sleep errors do not accumulate into drift
+        next_deadline = last_frame_time
         
         while event_index < total_events:
             key = get_user_input()
@@ -381,7 +610,7 @@ def run_replay(year, event_name, playback_speed):
                 if key == 'right':
                     current_race_time += pd.Timedelta(seconds=10)
                 if key == 'left':
-                    current_race_time = max(timeline_events[0]['Time'], current_race_time - pd.Timedelta(seconds=10))
+                    current_race_time = max(pd.Timedelta(event_times_ns[0]), current_race_time - pd.Timedelta(seconds=10))
                     event_index = 0
             real_time_now = time.monotonic()
             real_time_delta = real_time_now - last_frame_time
@@ -389,86 +618,63 @@ def run_replay(year, event_name, playback_speed):
             if not is_paused:
                 race_time_delta = pd.Timedelta(seconds=real_time_delta * playback_speed)
                 current_race_time += race_time_delta
-                while event_index < total_events and timeline_events[event_index]['Time'] <= current_race_time:
-                    event = timeline_events[event_index]
-                    drv = event['Driver']
-                    state = driver_state[drv]
-                    new_pos = event['Position']
-                    if new_pos != state['PreviousPosition'] and state['LastEventLap'] > 1:
-                        if new_pos < state['PreviousPosition']:
-                            state['PositionChangeSymbol'] = f"{POS_GAIN_COLOR}▲{RESET}"
-                        else:
-                            state['PositionChangeSymbol'] = f"{POS_LOSS_COLOR}▼{RESET}"
-                        state['PositionChangeExpiry'] = event['Time'] + OVERTAKE_ARROW_DURATION
-                    state['PreviousPosition'] = new_pos
-                    if event['EventType'] == 'PitIn':
-                        state['DisplayStatus'] = 'IN PIT'
-                    elif event['EventType'] == 'PitOut':
-                        state['DisplayStatus'] = 'OUT'
-                        state['PitStops'] += 1
-                    elif event['EventType'] == 'Sector1' and (state['DisplayStatus'] == 'OUT' or state['DisplayStatus'] == 'GRID'):
-                        state['DisplayStatus'] = ''
-                    if event['LapNumber'] > state['LastEventLap']:
-                        state['Prev_S2'], state['Prev_S3'] = state['S2'], state['S3']
-                        state['S1'], state['S2'], state['S3'] = pd.NaT, pd.NaT, pd.NaT
-                    state.update({
-                        "Position": new_pos, "LapNumber": event['LapNumber'], "Compound": event['Compound'], "TyreLife": event['TyreLife'], "GapToLeader": event['GapToLeader'], "Interval": event['Interval'], "LastEventType": event['EventType'], "LastEventLap": event['LapNumber'], "LastUpdateTime": event['Time'], 'IsPersonalBestS1': event['IsPersonalBestS1'], 'IsPersonalBestS2': event['IsPersonalBestS2'], 'IsPersonalBestS3': event['IsPersonalBestS3']
-                    })
-                    if event['EventType'] == 'Sector1':
-                        state['S1'] = event['Sector1Time']
-                        if pd.notna(state['S1']) and state['S1'] < best_s1_so_far:
-                            best_s1_so_far = state['S1']
-                    elif event['EventType'] == 'Sector2':
-                        state['S2'] = event['Sector2Time']
-                        if pd.notna(state['S2']) and state['S2'] < best_s2_so_far:
-                            best_s2_so_far = state['S2']
-                    elif event['EventType'] == 'Lap':
-                        state['S3'], state['PreviousLapTime'] = event['Sector3Time'], event['LapTime']
-                        if pd.notna(state['S3']) and state['S3'] < best_s3_so_far:
-                            best_s3_so_far = state['S3']
-                    event_index += 1
-                for drv in drivers:
-                    state = driver_state[drv]
-                    if state['Status'] == 'On Track':
-                        if state['LastEventLap'] >= total_laps and state['LastEventType'] == 'Lap':
-                            state['Status'] = results_df.loc[results_df['Abbreviation'] == drv, 'Status'].iloc[0]
-                            state['DisplayStatus'] = state['Status']
-                        elif (current_race_time - state['LastUpdateTime']) > RETIREMENT_THRESHOLD:
-                            state['Status'], state['DisplayStatus'] = 'DNF', 'DNF'
-
-            sorted_drivers = sorted(drivers, key=lambda d: (0 if driver_state[d]['Status'] == 'On Track' else 1, driver_state[d]['Position']))
-            race_laps = int(driver_state[sorted_drivers[0]]['LapNumber'])
-
-            current_track_status_code = '1'
-            if not track_status_df.empty:
-                current_statuses = track_status_df[track_status_df['Time'] - first_event_time <= current_race_time]
-                if not current_statuses.empty:
-                    current_track_status_code = str(current_statuses.iloc[-1]['Status'])
-            is_wet = False
-            if not weather_df.empty:
-                current_weather = weather_df[weather_df['Time'] - first_event_time <= current_race_time]
-                if not current_weather.empty:
-                    is_wet = current_weather.iloc[-1]['Rainfall'] == True
-            
-            drs_allowed = False
-            if not drs_status_df.empty:
-                drs_events = drs_status_df[drs_status_df['Time'] <= current_race_time]
-                if not drs_events.empty:
-                    drs_allowed = drs_events.iloc[-1]['DRS_Status']
+                # A large backlog (e.g. after skipping back) is applied over several frames within a per-frame
+                # time budget, so the screen keeps updating while the state catches up
+                catch_up_deadline = real_time_now + EVENT_CATCH_UP_BUDGET
+                positions_before = states.positions.copy()
+                current_race_time_ns = current_race_time.value
+                # Every event up to the current race time is due this frame; find the end of that window in one binary search
+                window_end = int(np.searchsorted(event_times_ns, current_race_time_ns, side='right'))
+                while event_index < window_end:
+                    stop = min(event_index + EVENT_BUDGET_CHECK_INTERVAL, window_end)
+                    advance_events(*timeline_arrays, event_index, stop, *states.kernel_arrays())
+                    event_index = stop
+                    if time.monotonic() > catch_up_deadline:
+                        break
+                # Copy the latest event's columns for every driver that received events, in one gather per column
+                touched_idx = np.flatnonzero(states.touched)
+                if len(touched_idx):
+                    k = states.last_event_index[touched_idx]
+                    states.laps[touched_idx], states.compounds[touched_idx], states.tyre_lives[touched_idx] = event_laps[k], event_compounds[k], event_tyre_lives[k]
+                    states.gaps_ns[touched_idx], states.intervals_ns[touched_idx] = event_gaps_ns[k], event_intervals_ns[k]
+                    states.last_event_types[touched_idx], states.last_update_ns[touched_idx] = event_type_codes[k], event_times_ns[k]
+                    states.personal_bests[touched_idx] = event_personal_bests[k]
+                    states.touched[:] = False
+                    if not np.array_equal(positions_before, states.positions, equal_nan=True):
+                        order_dirty = True
+                caught_up = event_index >= window_end
+                # Retirement checks compare against the latest event per driver, so they wait until the backlog is applied
+                if caught_up:
+                    for di in range(n_drivers):
+                        if states.statuses[di] == 'On Track':
+                            if states.last_event_laps[di] >= total_laps and states.last_event_types[di] == EV_LAP:
+                                states.statuses[di] = final_status_by_driver[drivers[di]]
+                                order_dirty = True
+                            elif (current_race_time_ns - states.last_update_ns[di]) > RETIREMENT_THRESHOLD_NS:
+                                states.statuses[di] = 'DNF'
+                                order_dirty = True
+
+            # The running order only changes when a position or a status changes, so only re-sort then
+            if order_dirty:
+                sorted_order = sorted(range(n_drivers), key=lambda di: (0 if states.statuses[di] == 'On Track' else 1, states.positions[di]))
+                order_dirty = False
+            race_laps = int(states.laps[sorted_order[0]])
+
+            current_race_time_ns = current_race_time.value
+            current_track_status_code = lookup_status(track_status_timeline, current_race_time_ns, '1')
+            is_wet = lookup_status(weather_timeline, current_race_time_ns, False)
+            drs_allowed = lookup_status(drs_timeline, current_race_time_ns, False)
 
             status_info = (current_track_status_code, drs_allowed, is_wet)
-            best_times = (best_s1_so_far, best_s2_so_far, best_s3_so_far)
             playback_info = (is_paused, playback_speed)
             
-            draw_leaderboard(year, event_name, driver_state, sorted_drivers, driver_teams, race_laps, total_laps, current_race_time, best_times, status_info, playback_info)
+            draw_leaderboard(year, event_name, states, sorted_order, driver_cells, race_laps, total_laps, current_race_time_ns, status_info, playback_info)
             
-            if is_paused:
-                time.sleep(FRAME_DURATION)
-            else:
-                processing_time = time.monotonic() - real_time_now
-                sleep_for = FRAME_DURATION - processing_time
-                if sleep_for > 0:
-                    time.sleep(sleep_for)
+            next_deadline += FRAME_DURATION
+            if next_deadline < real_time_now:
+                # After a stall, resume the schedule from now instead of rushing out the missed frames
+                next_deadline = real_time_now
+            wait_for_input(next_deadline)
     except Exception as e:
         print("\n--- A CRITICAL ERROR OCCURRED ---")
         traceback.print_exc()
@@ -512,7 +718,17 @@ if __name__ == "__main__":
                     print("\nBuilding timeline from existing raw data...")
                     if not run_script('build_timeline.py', year, event):
                         continue
-                run_replay(year, event, DEFAULT_PLAYBACK_SPEED)
+                # VMIN=0/VTIME=0 makes a read return immediately (b'' when no key is waiting), so get_user_input polls
+                # with a single read. This is a terminal setting rather than O_NONBLOCK, which would also make the
+                # shared stdout non-blocking; it is restored afterwards for the menu's input().
+                cbreak_settings = termios.tcgetattr(sys.stdin)
+                polling_settings = termios.tcgetattr(sys.stdin)
+                polling_settings[6][termios.VMIN], polling_settings[6][termios.VTIME] = 0, 0
+                termios.tcsetattr(sys.stdin, termios.TCSANOW, polling_settings)
+                try:
+                    run_replay(year, event, DEFAULT_PLAYBACK_SPEED)
+                finally:
+                    termios.tcsetattr(sys.stdin, termios.TCSADRAIN, cbreak_settings)
                 break
             except ValueError:
                 print("Invalid input.")